@@ -3,7 +3,10 @@
 import sys
 import types
 import collections
+import functools
 import io
+import itertools
+import struct
 
 from opcode2 import *
 from opcode2 import __all__ as _opcodes_all
@@ -48,18 +51,7 @@ def dis(x=None, *, file=None, depth=None):
     if x is None:
         distb(file=file)
         return
-    # Extract functions from methods.
-    if hasattr(x, '__func__'):
-        x = x.__func__
-    # Extract compiled code objects from...
-    if hasattr(x, '__code__'):  # ...a function, or
-        x = x.__code__
-    elif hasattr(x, 'gi_code'):  #...a generator object, or
-        x = x.gi_code
-    elif hasattr(x, 'ag_code'):  #...an asynchronous generator object, or
-        x = x.ag_code
-    elif hasattr(x, 'cr_code'):  #...a coroutine.
-        x = x.cr_code
+    x = _extract_code(x)
     # Perform the disassembly.
     if hasattr(x, '__dict__'):  # Class or module
         items = sorted(x.__dict__.items())
@@ -107,22 +99,26 @@ COMPILER_FLAG_NAMES = {
    512: "ASYNC_GENERATOR",
 }
 
+_FLAG_NAME_BY_BIT = [COMPILER_FLAG_NAMES.get(1<<i) for i in range(32)]
+
 def pretty_flags(flags):
     """Return pretty representation of code flags."""
     names = []
-    for i in range(32):
-        flag = 1<<i
-        if flags & flag:
-            names.append(COMPILER_FLAG_NAMES.get(flag, hex(flag)))
-            flags ^= flag
-            if not flags:
-                break
-    else:
-        names.append(hex(flags))
+    bits = flags & 0xFFFFFFFF
+    # Visit only the set bits, lowest first.
+    while bits:
+        flag = bits & -bits
+        name = _FLAG_NAME_BY_BIT[flag.bit_length() - 1]
+        names.append(name if name is not None else hex(flag))
+        bits ^= flag
+    rest = flags & ~0xFFFFFFFF
+    if rest or not names:
+        names.append(hex(rest))
     return ", ".join(names)
 
-def _get_code_object(x):
-    """Helper to handle methods, compiled or raw code objects, and strings."""
+def _extract_code(x):
+    """Extract the code object from methods, functions, generators and
+    coroutines. Any other object is returned unchanged."""
     # Extract functions from methods.
     if hasattr(x, '__func__'):
         x = x.__func__
@@ -135,6 +131,11 @@ def _get_code_object(x):
         x = x.ag_code
     elif hasattr(x, 'cr_code'):  #...a coroutine.
         x = x.cr_code
+    return x
+
+def _get_code_object(x):
+    """Helper to handle methods, compiled or raw code objects, and strings."""
+    x = _extract_code(x)
     # Handle source code.
     if isinstance(x, str):
         x = _try_compile(x, "<disassembly>")
@@ -149,36 +150,28 @@ def code_info(x):
     return _format_code_info(_get_code_object(x))
 
 def _format_code_info(co):
-    lines = []
-    lines.append("Name:              %s" % co.co_name)
-    lines.append("Filename:          %s" % co.co_filename)
-    lines.append("Argument count:    %s" % co.co_argcount)
-    lines.append("Positional-only arguments: %s" % co.co_posonlyargcount)
-    lines.append("Kw-only arguments: %s" % co.co_kwonlyargcount)
-    lines.append("Number of locals:  %s" % co.co_nlocals)
-    lines.append("Stack size:        %s" % (co.co_stacksize))
-    lines.append("Flags:             %s" % pretty_flags(co.co_flags))
+    header = (f"Name:              {co.co_name}\n"
+              f"Filename:          {co.co_filename}\n"
+              f"Argument count:    {co.co_argcount}\n"
+              f"Positional-only arguments: {co.co_posonlyargcount}\n"
+              f"Kw-only arguments: {co.co_kwonlyargcount}\n"
+              f"Number of locals:  {co.co_nlocals}\n"
+              f"Stack size:        {co.co_stacksize}\n"
+              f"Flags:             {pretty_flags(co.co_flags)}")
+    sections = [header]
     if co.co_consts:
-        lines.append("Constants:")
-        for i_c in enumerate(co.co_consts):
-            lines.append("%4d: %r" % i_c)
-    if co.co_names:
-        lines.append("Names:")
-        for i_n in enumerate(co.co_names):
-            lines.append("%4d: %s" % i_n)
-    if co.co_varnames:
-        lines.append("Variable names:")
-        for i_n in enumerate(co.co_varnames):
-            lines.append("%4d: %s" % i_n)
-    if co.co_freevars:
-        lines.append("Free variables:")
-        for i_n in enumerate(co.co_freevars):
-            lines.append("%4d: %s" % i_n)
-    if co.co_cellvars:
-        lines.append("Cell variables:")
-        for i_n in enumerate(co.co_cellvars):
-            lines.append("%4d: %s" % i_n)
-    return "\n".join(lines)
+        sections.append("Constants:")
+        sections.append("\n".join(f"{i:4d}: {c!r}"
+                                  for i, c in enumerate(co.co_consts)))
+    for title, names in (("Names:", co.co_names),
+                         ("Variable names:", co.co_varnames),
+                         ("Free variables:", co.co_freevars),
+                         ("Cell variables:", co.co_cellvars)):
+        if names:
+            sections.append(title)
+            sections.append("\n".join(f"{i:4d}: {n}"
+                                      for i, n in enumerate(names)))
+    return "\n".join(sections)
 
 def show_code(co, *, file=None):
     """Print details of methods, functions, or code to *file*.
@@ -202,6 +195,8 @@ _Instruction.is_jump_target.__doc__ = "True if other code jumps to here, otherwi
 _OPNAME_WIDTH = 20
 _OPARG_WIDTH = 5
 
+_OPNAME_PADDED = {name: name.ljust(_OPNAME_WIDTH) for name in opname}
+
 class Instruction(_Instruction):
     """Details for a bytecode operation
 
@@ -223,38 +218,34 @@ class Instruction(_Instruction):
         *mark_as_current* inserts a '-->' marker arrow as part of the line
         *offset_width* sets the width of the instruction offset field
         """
-        fields = []
         # Column: Source code line number
-        if lineno_width:
-            if self.starts_line is not None:
-                lineno_fmt = "%%%dd" % lineno_width
-                fields.append(lineno_fmt % self.starts_line)
-            else:
-                fields.append(' ' * lineno_width)
-        # Column: Current instruction indicator
-        if mark_as_current:
-            fields.append('-->')
+        if not lineno_width:
+            lineno = ''
+        elif self.starts_line is not None:
+            lineno = f'{self.starts_line:{lineno_width}d} '
         else:
-            fields.append('   ')
+            lineno = ' ' * (lineno_width + 1)
+        # Column: Current instruction indicator
+        current = '-->' if mark_as_current else '   '
         # Column: Jump target marker
-        if self.is_jump_target:
-            fields.append('>>')
-        else:
-            fields.append('  ')
-        # Column: Instruction offset from start of code sequence
-        fields.append(repr(self.offset).rjust(offset_width))
-        # Column: Opcode name
-        fields.append(self.opname.ljust(_OPNAME_WIDTH))
+        target = '>>' if self.is_jump_target else '  '
+        # Columns: Instruction offset from start of code sequence and
+        # opcode name
+        name = _OPNAME_PADDED.get(self.opname)
+        if name is None:
+            name = self.opname.ljust(_OPNAME_WIDTH)
+        line = (f'{lineno}{current} {target} '
+                f'{self.offset!r:>{offset_width}} {name}')
         # Column: Opcode argument
-        args = ' '.join(map(str, self.imm))
-        if args != '':
-            fields.append(args.rjust(_OPARG_WIDTH))
+        if self.imm:
+            args = ' '.join(map(str, self.imm))
+            line = f'{line} {args:>{_OPARG_WIDTH}}'
             if self.argrepr:
-                fields.append('(' + self.argrepr + ')')
-        return ' '.join(fields).rstrip()
+                line = f'{line} ({self.argrepr})'
+        return line.rstrip()
 
 
-def get_instructions(x, *, first_line=None):
+def get_instructions(x, *, first_line=None, include_jump_targets=True):
     """Iterator for the opcodes in methods, functions or code
 
     Generates a series of Instruction named tuples giving the details of
@@ -264,17 +255,21 @@ def get_instructions(x, *, first_line=None):
     be reported for the first source line in the disassembled code.
     Otherwise, the source line information (if any) is taken directly from
     the disassembled code object.
+
+    If *include_jump_targets* is false, the code is not scanned for jump
+    targets and every instruction reports is_jump_target as False.
     """
     co = _get_code_object(x)
     cell_names = [] # FIXME(sgross): # co.co_cellvars + co.co_freevars
-    linestarts = dict(findlinestarts(co))
+    linestarts = _get_linestarts(co)
     if first_line is not None:
         line_offset = first_line - co.co_firstlineno
     else:
         line_offset = 0
     return _get_instructions_bytes(co.co_code, co.co_varnames,
                                    co.co_consts, cell_names, linestarts,
-                                   line_offset)
+                                   line_offset,
+                                   include_jump_targets=include_jump_targets)
 
 def _get_const_info(const_index, const_list):
     """Helper to get optional details about const references
@@ -303,9 +298,58 @@ def _get_name_info(name_index, name_list):
         argrepr = repr(argval)
     return argval, argrepr
 
+def _format_reg(reg, varnames, nvarnames):
+    """Helper to get the repr of a register
+
+       Registers below nvarnames (the length of varnames) hold named
+       variables; the ones after them are temporaries, shown as '.t<n>'.
+       The temporaries' names are interned as the same few recur across
+       every code object.
+    """
+    if varnames is None or reg < nvarnames:
+        return _get_name_info(reg, varnames)[1]
+    return sys.intern('.t' + str(reg - nvarnames))
+
+# Formatters for the argrepr of opcodes that do not simply join the reprs
+# of their immediates. Each takes the immediates' reprs, the raw
+# immediates and a function formatting a register index.
+
+def _call_function_argrepr(argreprs, imm, format_reg):
+    return f'{format_reg(imm[0])} to {format_reg(imm[0]+imm[1])}'
+
+def _load_attr_argrepr(argreprs, imm, format_reg):
+    return f"{argreprs[0]}.{argreprs[1]}"
+
+def _store_attr_argrepr(argreprs, imm, format_reg):
+    return f"{argreprs[0]}.{argreprs[1]}=acc"
+
+def _store_subscr_argrepr(argreprs, imm, format_reg):
+    return f"{argreprs[0]}[{argreprs[1]}]=acc"
+
+def _binary_subscr_argrepr(argreprs, imm, format_reg):
+    return f"{argreprs[0]}[acc]"
+
+def _move_argrepr(argreprs, imm, format_reg):
+    return f"{argreprs[0]} <- {argreprs[1]}"
+
+def _unpack_argrepr(argreprs, imm, format_reg):
+    return f'{argreprs[0]} argcnt={argreprs[1]} after={argreprs[2]}'
+
+_argrepr_formatters = {
+    opmap['CALL_FUNCTION'].opcode: _call_function_argrepr,
+    opmap['LOAD_ATTR'].opcode: _load_attr_argrepr,
+    opmap['STORE_ATTR'].opcode: _store_attr_argrepr,
+    opmap['STORE_SUBSCR'].opcode: _store_subscr_argrepr,
+    opmap['BINARY_SUBSCR'].opcode: _binary_subscr_argrepr,
+    opmap['MOVE'].opcode: _move_argrepr,
+    opmap['COPY'].opcode: _move_argrepr,
+    opmap['UNPACK'].opcode: _unpack_argrepr,
+}
+
 
 def _get_instructions_bytes(code, varnames=None, constants=None,
-                            cells=None, linestarts=None, line_offset=0):
+                            cells=None, linestarts=None, line_offset=0,
+                            *, include_jump_targets=True):
     """Iterate over the instructions in a bytecode string.
 
     Generates a sequence of Instruction namedtuples giving the details of each
@@ -313,20 +357,23 @@ def _get_instructions_bytes(code, varnames=None, constants=None,
     (e.g. variable names, constants) can be specified using optional
     arguments.
 
+    If *include_jump_targets* is false, the bytecode is not scanned for
+    jump targets and is_jump_target is always False.
+
     """
+    _intrinsics = intrinsics
+    # The same registers and constants are referenced over and over, so
+    # their reprs are computed once per call.
+    reg_reprs = {}
+    const_infos = {}
+    nvarnames = 0 if varnames is None else len(varnames)
+
     def format_reg(reg):
-        if varnames is None or reg < len(varnames):
-            argval, argrepr = _get_name_info(reg, varnames)
-        else:
-            argrepr = '.t' + str(reg - len(varnames))
+        argrepr = reg_reprs.get(reg)
+        if argrepr is None:
+            argrepr = reg_reprs[reg] = _format_reg(reg, varnames, nvarnames)
         return argrepr
 
-    def get_const(idx):
-        return _get_const_info(idx, constants)[1]
-
-    def get_str(idx):
-        return _get_const_info(idx, constants)[0]
-
     def get_repr(bytecode, *imm):
         argvals = []
         argreprs = []
@@ -338,35 +385,27 @@ def _get_instructions_bytes(code, varnames=None, constants=None,
                 argval = offset + (arg if arg <= 0x7FFF else arg - 0x10000)
                 argrepr = "to " + repr(argval)
             elif fmt == 'str' or fmt == 'const':
-                argval, argrepr = _get_const_info(arg, constants)
+                info = const_infos.get(arg)
+                if info is None:
+                    info = const_infos[arg] = _get_const_info(arg, constants)
+                argval, argrepr = info
             elif fmt == 'cell':
                 argval, argrepr = _get_name_info(arg, cells)
             elif fmt == 'reg' or fmt == 'base':
                 argrepr = format_reg(arg)
             elif fmt == 'intrinsic':
-                argrepr = intrinsics[arg].name
+                argrepr = _intrinsics[arg].name
             else:
                 argrepr = str(argval)
 
             argvals.append(argval)
             argreprs.append(argrepr)
 
-        if bytecode.name == 'CALL_FUNCTION':
-            argrepr = f'{format_reg(imm[0])} to {format_reg(imm[0]+imm[1])}'
-        elif bytecode.name == 'LOAD_ATTR':
-            argrepr = f"{argreprs[0]}.{argreprs[1]}"
-        elif bytecode.name == 'STORE_ATTR':
-            argrepr = f"{argreprs[0]}.{argreprs[1]}=acc"
-        elif bytecode.name == 'STORE_SUBSCR':
-            argrepr = f"{argreprs[0]}[{argreprs[1]}]=acc"
-        elif bytecode.name == 'BINARY_SUBSCR':
-            argrepr = f"{argreprs[0]}[acc]"
-        elif bytecode.name == 'MOVE' or bytecode.name == 'COPY':
-            argrepr = f"{argreprs[0]} <- {argreprs[1]}"
-        elif bytecode.name == 'UNPACK':
-            argrepr = f'{argreprs[0]} argcnt={argreprs[1]} after={argreprs[2]}'
-        else:
+        formatter = _argrepr_formatters.get(bytecode.opcode)
+        if formatter is None:
             argrepr = '; '.join(argreprs)
+        else:
+            argrepr = formatter(argreprs, imm, format_reg)
 
         if len(argvals) == 0:
             argval = None
@@ -378,27 +417,39 @@ def _get_instructions_bytes(code, varnames=None, constants=None,
         return argval, argrepr
 
 
-    labels = findlabels(code)
+    if include_jump_targets:
+        # Decode the bytecode once and reuse it for both the jump target
+        # scan and the instruction stream.
+        decoded = list(_unpack_opargs(code))
+        labels = _findlabels(decoded)
+    else:
+        decoded = _unpack_opargs(code)
+        labels = ()
     starts_line = None
-    for offset, op, *imm in _unpack_opargs(code):
+    _opcodes = opcodes
+    _opname = opname
+    # Build the named tuples directly, skipping the Python-level __new__
+    # generated by namedtuple.
+    new_instruction = tuple.__new__
+    for offset, op, *imm in decoded:
         if linestarts is not None:
             starts_line = linestarts.get(offset, None)
             if starts_line is not None:
                 starts_line += line_offset
         is_jump_target = offset in labels
-        bytecode = opcodes[op]
-        argval, argrepr = get_repr(bytecode, *imm)
-        yield Instruction(opname[op], op,
-                          imm, argval, argrepr,
-                          offset, starts_line, is_jump_target)
+        argval, argrepr = get_repr(_opcodes[op], *imm)
+        yield new_instruction(Instruction,
+                              (_opname[op], op, imm, argval, argrepr,
+                               offset, starts_line, is_jump_target))
 
 def disassemble(co, lasti=-1, *, file=None):
     """Disassemble a code object."""
     cell_names = co.co_cellvars + co.co_freevars
-    linestarts = dict(findlinestarts(co))
+    linestarts = _get_linestarts(co)
     _disassemble_bytes(co.co_code, lasti, co.co_varnames,
                        co.co_consts, cell_names, linestarts, co.co_cell2reg,
-                       co.co_free2reg, co.co_exc_handlers, file=file)
+                       co.co_free2reg, co.co_exc_handlers, file=file,
+                       maxlineno=_get_max_lineno(co))
 
 def _disassemble_recursive(co, *, file=None, depth=None):
     disassemble(co, file=file)
@@ -414,11 +465,13 @@ def _disassemble_recursive(co, *, file=None, depth=None):
 def _disassemble_bytes(code, lasti=-1, varnames=None, constants=None,
                        cells=None, linestarts=None, cell2reg=None,
                        free2reg=None, exc_handlers=None,
-                       *, file=None, line_offset=0):
+                       *, file=None, line_offset=0, maxlineno=None):
     # Omit the line number column entirely if we have no line number info
     show_lineno = linestarts is not None
     if show_lineno:
-        maxlineno = max(linestarts.values()) + line_offset
+        if maxlineno is None:
+            maxlineno = max(linestarts.values())
+        maxlineno += line_offset
         if maxlineno >= 1000:
             lineno_width = len(str(maxlineno))
         else:
@@ -430,6 +483,9 @@ def _disassemble_bytes(code, lasti=-1, varnames=None, constants=None,
         offset_width = len(str(maxoffset))
     else:
         offset_width = 4
+    if file is None:
+        file = sys.stdout
+    write = file.write
     for instr in _get_instructions_bytes(code, varnames,
                                          constants, cells, linestarts,
                                          line_offset=line_offset):
@@ -437,19 +493,19 @@ def _disassemble_bytes(code, lasti=-1, varnames=None, constants=None,
                            instr.starts_line is not None and
                            instr.offset > 0)
         if new_source_line:
-            print(file=file)
+            write('\n')
         is_current_instr = instr.offset == lasti
-        print(instr._disassemble(lineno_width, is_current_instr, offset_width),
-              file=file)
+        write(instr._disassemble(lineno_width, is_current_instr,
+                                 offset_width) + '\n')
     if cell2reg:
-        print(' ' * 2 + f'Cell variables: {list(cell2reg)}', file=file)
+        write(f'  Cell variables: {list(cell2reg)}\n')
     if free2reg:
-        print(' ' * 2 + f'Free variables: {list(free2reg)}', file=file)
+        write(f'  Free variables: {list(free2reg)}\n')
     if exc_handlers:
-        print(' ' * 2 + f'Exception handlers ({len(exc_handlers)}):', file=file)
-        print(f'    start  ->  (handler,  end)', file=file)
+        write(f'  Exception handlers ({len(exc_handlers)}):\n')
+        write('    start  ->  (handler,  end)\n')
         for start, handler, end, reg in exc_handlers:
-            print(f'     {start:4d}  ->      {handler:4d}, {end:4d}  [reg={reg}]', file=file)
+            write(f'     {start:4d}  ->      {handler:4d}, {end:4d}  [reg={reg}]\n')
 
 def _disassemble_str(source, **kwargs):
     """Compile the source string, then disassemble the code object."""
@@ -460,56 +516,97 @@ disco = disassemble                     # XXX For backwards compatibility
 def signed(x):
     return x if x < 32768 else (x - 65536)
 
+# struct format characters for immediates, keyed by (size, signed)
+_IMM_FORMATS = {
+    (1, False): 'B',
+    (2, False): 'H',
+    (2, True): 'h',
+    (4, False): 'I',
+    (4, True): 'i',
+}
+
+def _imm_layouts(wide):
+    """Precompute, for each opcode, the offset of its immediates relative
+    to the start of the instruction and an unpack_from() function that
+    decodes all of them at once."""
+    start = 2 if wide else 1
+    layouts = [(start, struct.Struct('<').unpack_from)] * len(opcodes)
+    for bytecode in bytecodes:
+        fmt = ''.join(_IMM_FORMATS[bytecode.imm_size(i, wide=wide),
+                                   kind == 'jump']
+                      for i, kind in enumerate(bytecode.imm))
+        unpack = struct.Struct('<' + fmt).unpack_from
+        layouts[bytecode.opcode] = (start, unpack)
+    return layouts
+
+_IMM_LAYOUT = _imm_layouts(wide=False)
+_IMM_LAYOUT_WIDE = _imm_layouts(wide=True)
+_INSTR_SIZE = [bytecode and bytecode.size for bytecode in opcodes]
+_INSTR_SIZE_WIDE = [bytecode and bytecode.wide_size for bytecode in opcodes]
+_IS_JUMP = bytes(bytecode is not None and bytecode.is_jump()
+                 for bytecode in opcodes)
+
 def decode_imm(code, offset, bytecode, wide):
-    sizes = {
-        'imm16': 2,
-        'jump': 4 if wide else 2,
-    }
-    offset += 1
     if wide:
-        offset += 1
-    for imm in bytecode.imm:
-        signed = (imm == 'jump')
-        size = sizes.get(imm, 4 if wide else 1)
-        yield int.from_bytes(code[offset:offset+size], 'little', signed=signed)
-        offset += size
+        start, unpack = _IMM_LAYOUT_WIDE[bytecode.opcode]
+    else:
+        start, unpack = _IMM_LAYOUT[bytecode.opcode]
+    yield from unpack(code, offset + start)
 
 
 def _unpack_opargs(code):
-    extended_arg = 0
-    i = 0
+    # The immediates are decoded inline from the precomputed layout
+    # tables rather than through decode_imm(), which saves creating a
+    # generator for every instruction.
+    _opcodes = opcodes
     WIDE = opmap['WIDE']
-    while i < len(code):
-        wide = False
+    n = len(code)
+    i = 0
+    while i < n:
         op = code[i]
-        bytecode = opcodes[op]
+        bytecode = _opcodes[op]
         if bytecode is None:
             raise RuntimeError(f'bad opcode {op}')
 
-        if bytecode == WIDE:
-            wide = True
+        if bytecode is WIDE:
             op = code[i+1]
-            bytecode = opcodes[op]
-            size = bytecode.wide_size
+            if _opcodes[op] is None:
+                raise RuntimeError(f'bad opcode {op}')
+            start, unpack = _IMM_LAYOUT_WIDE[op]
+            size = _INSTR_SIZE_WIDE[op]
         else:
-            size = bytecode.size
+            start, unpack = _IMM_LAYOUT[op]
+            size = _INSTR_SIZE[op]
 
-        imm = list(decode_imm(code, i, bytecode, wide))
+        try:
+            imm = unpack(code, i + start)
+        except struct.error:
+            raise RuntimeError(
+                f'truncated instruction at offset {i}') from None
         yield (i, op, *imm)
         i += size
 
 def findlabels(code):
     """Detect all offsets in a byte code which are jump targets.
 
-    Return the list of offsets.
+    Return the sorted list of offsets.
 
     """
-    labels = []
-    for offset, op, *imm in _unpack_opargs(code):
-        if opcodes[op].is_jump():
-            label = offset + imm[-1]
-            if label not in labels:
-                labels.append(label)
+    if isinstance(code, bytes):
+        return sorted(_cached_labels(code))
+    return sorted(_findlabels(_unpack_opargs(code)))
+
+@functools.lru_cache(maxsize=256)
+def _cached_labels(code):
+    return frozenset(_findlabels(_unpack_opargs(code)))
+
+def _findlabels(decoded):
+    """Return the set of jump targets among already decoded instructions."""
+    is_jump = _IS_JUMP
+    labels = set()
+    for offset, op, *imm in decoded:
+        if is_jump[op]:
+            labels.add(offset + imm[-1])
     return labels
 
 def findlinestarts(code):
@@ -518,14 +615,43 @@ def findlinestarts(code):
     Generate pairs (offset, lineno) as described in Python/compile.c.
 
     """
-    byte_increments = code.co_lnotab[0::2]
-    line_increments = code.co_lnotab[1::2]
-    bytecode_len = len(code.co_code)
+    return _findlinestarts(code.co_lnotab, code.co_firstlineno,
+                           len(code.co_code))
+
+def _get_linestarts(co):
+    """Return a read-only mapping of line start offsets to line numbers.
+
+    All code objects hash alike and their equality ignores co_lnotab, so
+    the cache is keyed on the line number table itself.
+    """
+    return _cached_linestarts(co.co_lnotab, co.co_firstlineno,
+                              len(co.co_code))[0]
+
+def _get_max_lineno(co):
+    """Return the highest line number in co's line starts (or None)."""
+    return _cached_linestarts(co.co_lnotab, co.co_firstlineno,
+                              len(co.co_code))[1]
+
+@functools.lru_cache(maxsize=256)
+def _cached_linestarts(lnotab, firstlineno, bytecode_len):
+    linestarts = dict(_findlinestarts(lnotab, firstlineno, bytecode_len))
+    # Line numbers may decrease along the code, so the maximum is not
+    # simply the last entry.
+    maxlineno = max(linestarts.values(), default=None)
+    return types.MappingProxyType(linestarts), maxlineno
+
+def _findlinestarts(lnotab, firstlineno, bytecode_len):
+    byte_increments = lnotab[0::2]
+    # line_increments is an array of 8-bit signed integers
+    line_increments = memoryview(lnotab[1::2]).cast('b')
+    # The line number in effect at each lnotab entry, followed by the
+    # final line number.
+    linenos = list(itertools.accumulate(line_increments,
+                                        initial=firstlineno))
 
     lastlineno = None
-    lineno = code.co_firstlineno
     addr = 0
-    for byte_incr, line_incr in zip(byte_increments, line_increments):
+    for byte_incr, lineno in zip(byte_increments, linenos):
         if byte_incr:
             if lineno != lastlineno:
                 yield (addr, lineno)
@@ -535,10 +661,7 @@ def findlinestarts(code):
                 # The rest of the lnotab byte offsets are past the end of
                 # the bytecode, so the lines were optimized away.
                 return
-        if line_incr >= 0x80:
-            # line_increments is an array of 8-bit signed integers
-            line_incr -= 0x100
-        lineno += line_incr
+    lineno = linenos[-1]
     if lineno != lastlineno:
         yield (addr, lineno)
 
@@ -550,7 +673,8 @@ class Bytecode:
 
     Iterating over this yields the bytecode operations as Instruction instances.
     """
-    def __init__(self, x, *, first_line=None, current_offset=None):
+    def __init__(self, x, *, first_line=None, current_offset=None,
+                 include_jump_targets=True):
         self.codeobj = co = _get_code_object(x)
         if first_line is None:
             self.first_line = co.co_firstlineno
@@ -559,16 +683,17 @@ class Bytecode:
             self.first_line = first_line
             self._line_offset = first_line - co.co_firstlineno
         self._cell_names = co.co_cellvars + co.co_freevars
-        self._linestarts = dict(findlinestarts(co))
+        self._linestarts = _get_linestarts(co)
         self._original_object = x
         self.current_offset = current_offset
+        self._include_jump_targets = include_jump_targets
 
     def __iter__(self):
         co = self.codeobj
-        return _get_instructions_bytes(co.co_code, co.co_varnames,
-                                       co.co_consts, self._cell_names,
-                                       self._linestarts,
-                                       line_offset=self._line_offset)
+        return _get_instructions_bytes(
+            co.co_code, co.co_varnames, co.co_consts, self._cell_names,
+            self._linestarts, line_offset=self._line_offset,
+            include_jump_targets=self._include_jump_targets)
 
     def __repr__(self):
         return "{}({!r})".format(self.__class__.__name__,
@@ -585,25 +710,32 @@ class Bytecode:
         """Return formatted information about the code object."""
         return _format_code_info(self.codeobj)
 
-    def dis(self):
-        """Return a formatted view of the bytecode operations."""
+    def dis(self, *, file=None):
+        """Return a formatted view of the bytecode operations.
+
+        If *file* is provided, the disassembly is written to it directly
+        instead, and None is returned.
+        """
+        if file is None:
+            with io.StringIO() as output:
+                self.dis(file=output)
+                return output.getvalue()
         co = self.codeobj
         if self.current_offset is not None:
             offset = self.current_offset
         else:
             offset = -1
-        with io.StringIO() as output:
-            _disassemble_bytes(co.co_code, varnames=co.co_varnames,
-                               constants=co.co_consts,
-                               cells=self._cell_names,
-                               linestarts=self._linestarts,
-                               line_offset=self._line_offset,
-                               cell2reg=co.co_cell2reg,
-                               free2reg=co.co_free2reg,
-                               exc_handlers=co.co_exc_handlers,
-                               file=output,
-                               lasti=offset)
-            return output.getvalue()
+        _disassemble_bytes(co.co_code, varnames=co.co_varnames,
+                           constants=co.co_consts,
+                           cells=self._cell_names,
+                           linestarts=self._linestarts,
+                           line_offset=self._line_offset,
+                           maxlineno=_get_max_lineno(co),
+                           cell2reg=co.co_cell2reg,
+                           free2reg=co.co_free2reg,
+                           exc_handlers=co.co_exc_handlers,
+                           file=file,
+                           lasti=offset)
 
 
 def _test():
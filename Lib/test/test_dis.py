@@ -9,6 +9,7 @@ import io
 import re
 import types
 import contextlib
+import weakref
 
 def get_tb():
     def _error():
@@ -650,12 +651,28 @@ class DisTests(unittest.TestCase):
     def test_disassemble_bytes(self):
         self.do_disassembly_test(_f.__code__.co_code, dis_f_co_code)
 
+    def test_disassemble_malformed_bytes(self):
+        load_const = dis.opmap['LOAD_CONST'].opcode
+        wide = dis.opmap['WIDE'].opcode
+        bad = 0  # no opcode is defined as 0
+        # Truncated final instruction
+        with self.assertRaisesRegex(RuntimeError, 'truncated instruction'):
+            list(dis._unpack_opargs(bytes([load_const])))
+        # Undefined opcode, with and without a WIDE prefix
+        for code in [bytes([bad]), bytes([wide, bad])]:
+            with self.subTest(code=code):
+                with self.assertRaisesRegex(RuntimeError, 'bad opcode'):
+                    list(dis._unpack_opargs(code))
+
     def test_disassemble_class(self):
         self.do_disassembly_test(_C, dis_c)
 
     def test_disassemble_instance_method(self):
         self.do_disassembly_test(_C(1).__init__, dis_c_instance_method)
 
+    def test_disassemble_weakref_proxy(self):
+        self.do_disassembly_test(weakref.proxy(_f), dis_f)
+
     def test_disassemble_instance_method_bytes(self):
         method_bytecode = _C(1).__init__.__code__.co_code
         self.do_disassembly_test(method_bytecode, dis_c_instance_method_bytes)
@@ -1232,6 +1249,13 @@ class InstructionTests(BytecodeTestCase):
         actual = dis.get_instructions(jumpy, first_line=expected_jumpy_line)
         self.assertEqual(list(actual), expected_opinfo_jumpy)
 
+    def test_without_jump_targets(self):
+        actual = dis.get_instructions(jumpy, first_line=expected_jumpy_line,
+                                      include_jump_targets=False)
+        expected = [instr._replace(is_jump_target=False)
+                    for instr in expected_opinfo_jumpy]
+        self.assertEqual(list(actual), expected)
+
 # get_instructions has its own tests above, so can rely on it to validate
 # the object oriented API
 class BytecodeTests(unittest.TestCase):
@@ -1252,10 +1276,30 @@ class BytecodeTests(unittest.TestCase):
                 via_generator = list(dis.get_instructions(obj))
                 self.assertEqual(via_object, via_generator)
 
+    def test_code_extraction(self):
+        # Methods and weakref proxies resolve to the underlying code object
+        for obj, func in [(_C(1).__init__, _C.__init__),
+                          (weakref.proxy(_f), _f)]:
+            with self.subTest(obj=obj):
+                self.assertIs(dis.Bytecode(obj).codeobj, func.__code__)
+                self.assertEqual(list(dis.get_instructions(obj)),
+                                 list(dis.get_instructions(func)))
+
     def test_explicit_first_line(self):
         actual = dis.Bytecode(outer, first_line=expected_outer_line)
         self.assertEqual(list(actual), expected_opinfo_outer)
 
+    def test_without_jump_targets(self):
+        for obj in [_f, jumpy, "a=1"]:
+            with self.subTest(obj=obj):
+                via_object = list(dis.Bytecode(obj,
+                                               include_jump_targets=False))
+                via_generator = list(dis.get_instructions(
+                    obj, include_jump_targets=False))
+                self.assertEqual(via_object, via_generator)
+                self.assertFalse(any(instr.is_jump_target
+                                     for instr in via_object))
+
     def test_source_line_in_disassembly(self):
         # Use the line in the source code
         actual = dis.Bytecode(simple).dis()
@@ -1277,6 +1321,11 @@ class BytecodeTests(unittest.TestCase):
         actual = dis.Bytecode(_f).dis()
         self.assertEqual(actual, dis_f)
 
+    def test_disassembled_to_file(self):
+        output = io.StringIO()
+        self.assertIsNone(dis.Bytecode(_f).dis(file=output))
+        self.assertEqual(output.getvalue(), dis_f)
+
     def test_from_traceback(self):
         tb = get_tb()
         b = dis.Bytecode.from_traceback(tb)